@@ -0,0 +1,111 @@
+import numpy as np
+import scipy
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import maximum_flow
+
+# linprog gained the HiGHS solvers in scipy 1.6; older releases fall back to the sparse interior-point solver
+HIGHS_AVAILABLE = tuple(int(part) for part in scipy.__version__.split('.')[:2]) >= (1, 6)
+LINPROG_SOLVER = dict(method="highs-ipm") if HIGHS_AVAILABLE else \
+    dict(method="interior-point", options={"sparse": True})
+
+
+def lp_upper_bound(simulation) -> float:
+    """
+    Upper bound on the completed weight of any router, from the LP relaxation of a flow over the burst slots.
+    Variables are x_{s,t} (packets of superpacket s accepted at burst slot t), y_s (superpacket s is completed),
+    s_t (packets transmitted at burst slot t) and b_t (buffer occupancy at the end of burst slot t):
+        max  sum w_s * y_s
+        s.t. threshold * y_s <= sum_t x_{s,t}
+             b_{t-1} + sum_s x_{s,t} = s_t + b_t
+             0 <= x_{s,t} <= packets of s arriving at t,  0 <= y_s <= 1
+             0 <= s_t <= capacity,  0 <= b_t <= buffer_size,  b_T = 0
+    Routers only act on burst slots, and packets left in the buffer after the last burst are never transmitted.
+    In the unweighted case the LP is a max-flow problem, solved by max_flow_upper_bound.
+    """
+    if simulation.completed_threshold == 0:
+        return sum(sp.weight if simulation.weighted else 1 for sp in simulation.superpackets)
+    if simulation.weighted:
+        return weighted_lp_upper_bound(simulation)
+    return max_flow_upper_bound(simulation)
+
+
+def _superpacket_slot_pairs(simulation):
+    """
+    Returns the (superpacket, burst slot) pairs that have arrivals, with the number of packets arriving in each
+    """
+    superpackets = simulation.superpackets
+    burst_times = np.array(simulation.arrival_index.burst_times)
+    slots_count = len(burst_times)
+
+    superpacket_sizes = np.array([len(sp.packets) for sp in superpackets])
+    packet_superpackets = np.repeat(np.arange(len(superpackets)), superpacket_sizes)
+    packet_slots = np.searchsorted(burst_times, [p.arrival_time for sp in superpackets for p in sp.packets])
+    pairs, pair_sizes = np.unique(packet_superpackets * slots_count + packet_slots, return_counts=True)
+    pair_superpackets, pair_slots = np.divmod(pairs, slots_count)
+    return pair_superpackets, pair_slots, pair_sizes, slots_count
+
+
+def max_flow_upper_bound(simulation) -> float:
+    """
+    Unweighted bound: the max flow of
+        source -> superpacket (threshold) -> burst slot (packets of the superpacket arriving at it) -> sink (capacity),
+    with burst slot -> next burst slot (buffer_size) edges, divided by the completion threshold
+    """
+    pair_superpackets, pair_slots, pair_sizes, slots_count = _superpacket_slot_pairs(simulation)
+    superpackets_count = len(simulation.superpackets)
+    source = 0
+    superpacket_nodes = 1 + np.arange(superpackets_count)
+    slot_nodes = 1 + superpackets_count + np.arange(slots_count)
+    sink = 1 + superpackets_count + slots_count
+
+    tails = np.concatenate([np.full(superpackets_count, source), superpacket_nodes[pair_superpackets],
+                            slot_nodes, slot_nodes[:-1]])
+    heads = np.concatenate([superpacket_nodes, slot_nodes[pair_slots], np.full(slots_count, sink), slot_nodes[1:]])
+    capacities = np.concatenate([np.full(superpackets_count, simulation.completed_threshold), pair_sizes,
+                                 np.full(slots_count, simulation.capacity),
+                                 np.full(slots_count - 1, simulation.buffer_size)])
+    graph = coo_matrix((capacities.astype(np.int32), (tails, heads)), shape=(sink + 1, sink + 1)).tocsr()
+
+    return maximum_flow(graph, source, sink).flow_value / simulation.completed_threshold
+
+
+def weighted_lp_upper_bound(simulation) -> float:
+    """
+    Weighted bound: the LP above solved with linprog, using HiGHS when scipy provides it
+    """
+    superpackets = simulation.superpackets
+    pair_superpackets, pair_slots, pair_sizes, slots_count = _superpacket_slot_pairs(simulation)
+    superpackets_count = len(superpackets)
+    pairs_count = len(pair_sizes)
+
+    y_offset = pairs_count
+    s_offset = y_offset + superpackets_count
+    b_offset = s_offset + slots_count
+    variables_count = b_offset + slots_count
+    pair_columns = np.arange(pairs_count)
+    slot_rows = np.arange(slots_count)
+
+    a_ub = coo_matrix((
+        np.concatenate([np.full(superpackets_count, simulation.completed_threshold), -np.ones(pairs_count)]),
+        (np.concatenate([np.arange(superpackets_count), pair_superpackets]),
+         np.concatenate([y_offset + np.arange(superpackets_count), pair_columns]))
+    ), shape=(superpackets_count, variables_count))
+    a_eq = coo_matrix((
+        np.concatenate([-np.ones(pairs_count), np.ones(2 * slots_count), -np.ones(slots_count - 1)]),
+        (np.concatenate([pair_slots, slot_rows, slot_rows, slot_rows[1:]]),
+         np.concatenate([pair_columns, s_offset + slot_rows, b_offset + slot_rows, b_offset + slot_rows[:-1]]))
+    ), shape=(slots_count, variables_count))
+
+    objective = np.zeros(variables_count)
+    objective[y_offset:s_offset] = [-sp.weight for sp in superpackets]
+    upper_bounds = np.concatenate([pair_sizes, np.ones(superpackets_count), np.full(slots_count, simulation.capacity),
+                                   np.full(slots_count, simulation.buffer_size)])
+    upper_bounds[-1] = 0
+    bounds = np.stack([np.zeros(variables_count), upper_bounds], axis=1)
+
+    res = linprog(objective, A_ub=a_ub.tocsr(), b_ub=np.zeros(superpackets_count), A_eq=a_eq.tocsr(),
+                  b_eq=np.zeros(slots_count), bounds=bounds, **LINPROG_SOLVER)
+    if not res.success:
+        raise ValueError(f"Failed to solve the LP relaxation: {res.message}")
+    return -res.fun
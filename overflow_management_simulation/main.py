@@ -23,6 +23,7 @@ sns.set_style("darkgrid")
 
 DEFAULT_CONF_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
 DEFAULT_CSV_OUTPUT_PATH = os.path.join(tempfile.mkdtemp(), 'simulation_results.csv')
+DEFAULT_TELEMETRY_CSV_OUTPUT_PATH = os.path.join(os.path.dirname(DEFAULT_CSV_OUTPUT_PATH), 'telemetry.csv')
 
 matplotlib.use("TKAgg")
 
@@ -58,6 +59,9 @@ class SimulationParams:
 
     sharex: bool = True
 
+    record_telemetry: bool = False
+    report_lp_bound: bool = False
+
     @property
     def simulations_count(self):
         return len(self.beta_values) * len(self.lam_values) * len(self.k_values) * len(self.capacity_values) * len(
@@ -109,6 +113,7 @@ def main():
     simulations_params = [b_values_simulation_params]
 
     all_dfs = []
+    telemetry_dfs = []
     with tqdm(total=sum(simulation_params.simulations_count for simulation_params in simulations_params),
               file=sys.stdout) as pbar:
         for simulation_params in simulations_params:
@@ -146,18 +151,32 @@ def main():
                                     simulation = Simulation(superpackets=traffic_generator.generate_superpackets(),
                                                             beta=beta, k=k, capacity=capacity, buffer_size=buffer_size)
                                     for router in routers:
-                                        res = simulation.run(router=router)
+                                        res = simulation.run(router=router,
+                                                             record_telemetry=simulation_params.record_telemetry)
                                         results_by_router[str(router)].append(res)
+                                        if simulation_params.record_telemetry:
+                                            telemetry_df = res.telemetry_dataframe()
+                                            telemetry_df = telemetry_df.assign(router=str(router), repeat=repeat,
+                                                                               beta=beta, lam=lam, k=k,
+                                                                               average_burst_size=simulation
+                                                                               .average_burst_size,
+                                                                               capacity=capacity,
+                                                                               buffer_size=buffer_size)
+                                            telemetry_dfs.append(telemetry_df)
                                     pbar.update(1)
 
                                 all_results.extend([
                                     SimulationsResult(router_name=router_name, k=k, beta=beta, lam=lam,
                                                       capacity=capacity, buffer_size=buffer_size, results=results)
                                     for router_name, results in results_by_router.items()])
-            rows = [r.to_dict() for r in all_results]
+            rows = [r.to_dict(include_lp_bound=simulation_params.report_lp_bound) for r in all_results]
             df = pd.DataFrame(rows)
             all_dfs.append(df)
 
+    if telemetry_dfs:
+        pd.concat(telemetry_dfs, ignore_index=True).to_csv(DEFAULT_TELEMETRY_CSV_OUTPUT_PATH, index=False)
+        print(f'Telemetry saved to {DEFAULT_TELEMETRY_CSV_OUTPUT_PATH}')
+
     for simulation_params, df in zip(simulations_params, all_dfs):
         print(df.groupby('beta')['average_burst_size'].mean())
         print(df.groupby('beta')['average_effective_load'].mean().mean())
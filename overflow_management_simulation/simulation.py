@@ -1,13 +1,14 @@
 from collections import defaultdict
 from dataclasses import dataclass
 from itertools import combinations, chain, product
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from cached_property import cached_property
 
 from overflow_management_simulation.routers import Router
 from overflow_management_simulation.simulation_results import SimulationResult
 from overflow_management_simulation.superpacket import Superpacket, Packet
+from overflow_management_simulation.telemetry import SimulationTelemetry
 
 
 @dataclass
@@ -22,17 +23,49 @@ class Burst:
         }
 
 
+class ArrivalIndex:
+    """
+    Packet positions bucketed by arrival time in a single pass. Positions are (superpacket, packet) indices,
+    so the index can be shared by simulations over clones of the same superpackets.
+    """
+
+    def __init__(self, superpackets: List[Superpacket]):
+        self.T = max(sp.max_time for sp in superpackets)
+        self._slots: List[List[Tuple[int, int]]] = [[] for _ in range(self.T + 1)]
+        for sp_index, sp in enumerate(superpackets):
+            for packet_index, packet in enumerate(sp.packets):
+                self._slots[packet.arrival_time].append((sp_index, packet_index))
+        self.burst_times = [t for t, slot in enumerate(self._slots) if slot]
+        self.average_burst_size = sum(len(self._slots[t]) for t in self.burst_times) / float(len(self.burst_times))
+
+    def burst_at(self, superpackets: List[Superpacket], t: int) -> Optional[Burst]:
+        if not 0 <= t <= self.T or not self._slots[t]:
+            return None
+        return Burst(time=t, packets=[superpackets[sp_index].packets[packet_index]
+                                      for sp_index, packet_index in self._slots[t]])
+
+    def bursts(self, superpackets: List[Superpacket]) -> List[Burst]:
+        return [self.burst_at(superpackets, t) for t in self.burst_times]
+
+
 class Simulation:
-    def __init__(self, superpackets: List[Superpacket], beta: float, k: int, capacity: int, buffer_size: int):
+    def __init__(self, superpackets: List[Superpacket], beta: float, k: int, capacity: int, buffer_size: int,
+                 arrival_index: Optional[ArrivalIndex] = None):
         self.superpackets = superpackets
         self.k = k
         self.beta = beta
         self.capacity = capacity
         self.buffer_size = buffer_size
+        self._arrival_index = arrival_index
 
     def clone(self):
         cloned_superpackets = [sp.clone() for sp in self.superpackets]
-        return Simulation(cloned_superpackets, self.beta, self.k, self.capacity, self.buffer_size)
+        return Simulation(cloned_superpackets, self.beta, self.k, self.capacity, self.buffer_size,
+                          arrival_index=self.arrival_index)
+
+    @cached_property
+    def arrival_index(self) -> ArrivalIndex:
+        return self._arrival_index or ArrivalIndex(self.superpackets)
 
     @cached_property
     def weighted(self):
@@ -40,44 +73,56 @@ class Simulation:
 
     @cached_property
     def T(self):
-        return max(sp.max_time for sp in self.superpackets)
+        return self.arrival_index.T
 
     @cached_property
     def completed_threshold(self):
         return round((1 - self.beta) * self.k)
 
+    @cached_property
+    def lp_upper_bound(self) -> float:
+        from overflow_management_simulation.lp_bound import lp_upper_bound
+        return lp_upper_bound(self)
+
     def is_superpacket_completed(self, packets: List[Packet]):
         return len(packets) >= self.completed_threshold
 
     @cached_property
     def bursts(self) -> List[Burst]:
-        res = []
-        for t in range(self.T + 1):
-            participating_packets = [p for sp in self.superpackets for p in sp.packets if p.arrival_time == t]
-            if participating_packets:
-                res.append(Burst(time=t, packets=participating_packets))
-        return res
+        return self.arrival_index.bursts(self.superpackets)
+
+    def burst_at(self, t: int) -> Optional[Burst]:
+        return self.arrival_index.burst_at(self.superpackets, t)
 
     @cached_property
     def average_burst_size(self):
-        return sum(len(burst.packets) for burst in self.bursts) / float(len(self.bursts))
+        return self.arrival_index.average_burst_size
 
-    def run(self, router: Router) -> SimulationResult:
+    def run(self, router: Router, record_telemetry: bool = False) -> SimulationResult:
         router.buffer.clear()
-        transmitted_packets: List[Packet] = [packet
-                                             for burst in self.bursts
-                                             for packet in router.route(burst, self.capacity, self.buffer_size)]
-
-        return self.evaluate_assignment(transmitted_packets)
-
-    def evaluate_assignment(self, transmitted_packets: List[Packet]) -> SimulationResult:
+        telemetry = SimulationTelemetry(self.superpackets, self.T, self.completed_threshold) if record_telemetry else None
+        transmitted_packets: List[Packet] = []
+        for burst in self.bursts:
+            buffered_before = len(router.buffer)
+            burst_transmitted_packets = router.route(burst, self.capacity, self.buffer_size)
+            if telemetry is not None:
+                telemetry.record(burst.time, len(burst.packets), buffered_before, burst_transmitted_packets,
+                                 len(router.buffer))
+            transmitted_packets.extend(burst_transmitted_packets)
+
+        if telemetry is not None:
+            telemetry.fill_idle_slots()
+        return self.evaluate_assignment(transmitted_packets, telemetry=telemetry)
+
+    def evaluate_assignment(self, transmitted_packets: List[Packet],
+                            telemetry: Optional[SimulationTelemetry] = None) -> SimulationResult:
         superpacket_to_transmitted_packets: Dict[Superpacket, List[Packet]] = defaultdict(list)
         for packet in transmitted_packets:
             superpacket_to_transmitted_packets[packet.superpacket].append(packet)
 
         completed_superpackets = [sp for sp, packets in superpacket_to_transmitted_packets.items()
                                   if self.is_superpacket_completed(packets)]
-        return SimulationResult(self, self.superpackets, completed_superpackets)
+        return SimulationResult(self, self.superpackets, completed_superpackets, telemetry=telemetry)
 
     def find_opt(self):
         if self.buffer_size > 0:
@@ -1,17 +1,20 @@
 import pandas as pd
 
-from typing import List
+from typing import List, Optional
 
 from cached_property import cached_property
 
 from overflow_management_simulation.superpacket import Superpacket
+from overflow_management_simulation.telemetry import SimulationTelemetry
 
 
 class SimulationResult:
-    def __init__(self, simulation, superpackets: List[Superpacket], completed_superpackets: List[Superpacket]):
+    def __init__(self, simulation, superpackets: List[Superpacket], completed_superpackets: List[Superpacket],
+                 telemetry: Optional[SimulationTelemetry] = None):
         self.simulation = simulation
         self.superpackets = superpackets
         self.completed_superpackets = completed_superpackets
+        self.telemetry = telemetry
 
     @property
     def max_time(self):
@@ -37,6 +40,18 @@ class SimulationResult:
         else:
             return len(self.completed_superpackets) / self.completed_upper_bound
 
+    @property
+    def lp_success_rate(self):
+        completed = self.completed_weight if self.simulation.weighted else len(self.completed_superpackets)
+        if not self.simulation.lp_upper_bound:
+            return 1.0
+        return completed / self.simulation.lp_upper_bound
+
+    def telemetry_dataframe(self) -> pd.DataFrame:
+        if self.telemetry is None:
+            raise ValueError("Telemetry was not recorded for this run")
+        return self.telemetry.to_dataframe()
+
 
 class SimulationsResult:
     def __init__(self, router_name, k, beta, lam, capacity, buffer_size, results):
@@ -56,6 +71,10 @@ class SimulationsResult:
     def average_success_rate(self):
         return self._average(lambda x: x.success_rate)
 
+    @cached_property
+    def average_lp_success_rate(self):
+        return self._average(lambda x: x.lp_success_rate)
+
     @cached_property
     def average_n(self):
         return self._average(lambda x: len(x.superpackets))
@@ -71,8 +90,8 @@ class SimulationsResult:
     def print(self):
         print(f'{self.router_name} - {self.beta} - {self.average_success_rate:.2f}')
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_lp_bound: bool = False):
+        res = {
             "router": self.router_name,
             "beta": self.beta,
             "success_rate": self.average_success_rate,
@@ -84,3 +103,6 @@ class SimulationsResult:
             "capacity": self.capacity,
             "buffer_size": self.buffer_size,
         }
+        if include_lp_bound:
+            res["lp_success_rate"] = self.average_lp_success_rate
+        return res
@@ -0,0 +1,59 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from overflow_management_simulation.superpacket import Packet, Superpacket
+
+
+class SimulationTelemetry:
+    """
+    Per-slot link and buffer counters of a single router run, stored in arrays preallocated for slots 0..T.
+    Slots without a burst are never routed, so their arrivals, transmissions and drops stay zero, while
+    buffer occupancy and partial superpackets carry over from the last routed slot.
+    """
+
+    def __init__(self, superpackets: List[Superpacket], T: int, completed_threshold: int):
+        self.completed_threshold = completed_threshold
+        self.arrivals = np.zeros(T + 1, dtype=np.int64)
+        self.transmissions = np.zeros(T + 1, dtype=np.int64)
+        self.buffer_occupancy = np.zeros(T + 1, dtype=np.int64)
+        self.drops = np.zeros(T + 1, dtype=np.int64)
+        self.partial_superpackets = np.zeros(T + 1, dtype=np.int64)
+        self._recorded = np.zeros(T + 1, dtype=bool)
+        self._superpacket_positions: Dict[Superpacket, int] = {sp: i for i, sp in enumerate(superpackets)}
+        self._transmitted_per_superpacket = np.zeros(len(superpackets), dtype=np.int64)
+        self._partial_count = 0
+
+    def record(self, t: int, arrivals: int, buffered_before: int, transmitted_packets: List[Packet],
+               buffered_after: int):
+        for packet in transmitted_packets:
+            position = self._superpacket_positions[packet.superpacket]
+            self._transmitted_per_superpacket[position] += 1
+            transmitted = self._transmitted_per_superpacket[position]
+            if transmitted == 1 and self.completed_threshold > 1:
+                self._partial_count += 1
+            elif transmitted == self.completed_threshold and transmitted > 1:
+                self._partial_count -= 1
+
+        self.arrivals[t] = arrivals
+        self.transmissions[t] = len(transmitted_packets)
+        self.buffer_occupancy[t] = buffered_after
+        self.drops[t] = arrivals + buffered_before - len(transmitted_packets) - buffered_after
+        self.partial_superpackets[t] = self._partial_count
+        self._recorded[t] = True
+
+    def fill_idle_slots(self):
+        last_recorded_slot = np.maximum.accumulate(np.where(self._recorded, np.arange(len(self._recorded)), 0))
+        self.buffer_occupancy = self.buffer_occupancy[last_recorded_slot]
+        self.partial_superpackets = self.partial_superpackets[last_recorded_slot]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "time": np.arange(len(self.arrivals)),
+            "arrivals": self.arrivals,
+            "transmissions": self.transmissions,
+            "buffer_occupancy": self.buffer_occupancy,
+            "drops": self.drops,
+            "partial_superpackets": self.partial_superpackets,
+        })
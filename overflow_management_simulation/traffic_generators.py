@@ -87,10 +87,17 @@ class PoissonTrafficGenerator(TrafficGenerator):
     n: int
 
     def generate_superpackets(self):
-        return [self.generate_superpacket(self.n, sp_id, self.generate_arrival_times()) for sp_id in range(self.n)]
+        arrival_times_matrix = self.generate_arrival_times_matrix(self.n).tolist()
+        return [self.generate_superpacket(self.n, sp_id, arrival_times)
+                for sp_id, arrival_times in enumerate(arrival_times_matrix)]
 
     def generate_arrival_times(self):
-        arrival_intervals = np.random.poisson(self.lam, size=self.k + 1)
+        return self.generate_arrival_times_matrix(1)[0].tolist()
+
+    def generate_arrival_times_matrix(self, n: int) -> np.ndarray:
+        """
+        Draws the arrival times of n superpackets at once, one superpacket per row
+        """
+        arrival_intervals = np.random.poisson(self.lam, size=(n, self.k + 1))
         arrival_intervals[arrival_intervals == 0] = 1
-        arrival_times = [sum(arrival_intervals[0:i]) for i in range(1, self.k + 1)]
-        return arrival_times
+        return np.cumsum(arrival_intervals[:, :self.k], axis=1)